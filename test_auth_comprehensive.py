@@ -4,43 +4,71 @@ Comprehensive Authentication Test for DevSensei
 Tests both frontend and backend authentication flow
 """
 
-import requests
-import time
-import json
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+import asyncio
+import contextlib
+import httpx
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+
+# Browser-based tests, in the order they run against the loaded page
+BROWSER_TESTS = ("Firebase Config", "Auth Buttons", "Console Errors", "AuthContext Init")
 
 class AuthTester:
     def __init__(self):
         self.frontend_url = "http://localhost:5173"
         self.backend_url = "http://localhost:8000"
-        self.driver = None
-        
-    def setup_driver(self):
-        """Setup Chrome driver for testing"""
-        chrome_options = Options()
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
+        self.client = None
+        self.playwright = None
+        self.browser = None
+        self.page = None
+        self.console_errors = []
         
+    async def setup_browser(self):
+        """Launch headless Chromium with one page shared by all browser tests"""
         try:
-            self.driver = webdriver.Chrome(options=chrome_options)
-            print("✅ Chrome driver initialized successfully")
+            self.playwright = await async_playwright().start()
+            self.browser = await self.playwright.chromium.launch(
+                args=["--no-sandbox", "--disable-dev-shm-usage", "--disable-gpu"]
+            )
+            self.page = await self.browser.new_page(viewport={"width": 1920, "height": 1080})
+            
+            # Collect errors for the whole session; the browser tests below all
+            # inspect a single page load instead of reloading it each time
+            self.page.on("console", self._record_console_message)
+            self.page.on("pageerror", lambda error: self.console_errors.append(str(error)))
+            
+            print("✅ Chromium browser initialized successfully")
             return True
         except Exception as e:
-            print(f"❌ Failed to initialize Chrome driver: {e}")
+            print(f"❌ Failed to initialize Chromium browser: {e}")
             return False
     
-    def test_backend_health(self):
+    def _record_console_message(self, msg):
+        """Keep console errors raised while the page is open"""
+        if msg.type == "error":
+            self.console_errors.append(msg.text)
+    
+    async def teardown_browser(self):
+        """Close the browser and stop Playwright"""
+        if self.browser:
+            await self.browser.close()
+        if self.playwright:
+            await self.playwright.stop()
+    
+    @contextlib.asynccontextmanager
+    async def _http_client(self):
+        """Yield the shared HTTP client, or a short-lived one when a test runs on its own"""
+        if self.client is not None:
+            yield self.client
+        else:
+            async with httpx.AsyncClient() as client:
+                yield client
+    
+    async def test_backend_health(self):
         """Test backend health endpoint"""
         print("\n🔍 Testing Backend Health...")
         try:
-            response = requests.get(f"{self.backend_url}/api/health/", timeout=5)
+            async with self._http_client() as client:
+                response = await client.get(f"{self.backend_url}/api/health/", timeout=5)
             if response.status_code == 200:
                 print("✅ Backend health check passed")
                 return True
@@ -51,11 +79,12 @@ class AuthTester:
             print(f"❌ Backend health check error: {e}")
             return False
     
-    def test_frontend_access(self):
+    async def test_frontend_access(self):
         """Test if frontend is accessible"""
         print("\n🔍 Testing Frontend Access...")
         try:
-            response = requests.get(self.frontend_url, timeout=10)
+            async with self._http_client() as client:
+                response = await client.get(self.frontend_url, timeout=10)
             if response.status_code == 200:
                 print("✅ Frontend is accessible")
                 return True
@@ -70,17 +99,12 @@ class AuthTester:
         """Test Firebase configuration in browser"""
         print("\n🔍 Testing Firebase Configuration...")
         try:
-            self.driver.get(self.frontend_url)
-            time.sleep(3)
-            
-            # Check for console errors
-            logs = self.driver.get_log('browser')
-            firebase_errors = [log for log in logs if 'firebase' in log['message'].lower() and log['level'] == 'SEVERE']
+            firebase_errors = [error for error in self.console_errors if 'firebase' in error.lower()]
             
             if firebase_errors:
                 print("❌ Firebase configuration errors found:")
                 for error in firebase_errors:
-                    print(f"   - {error['message']}")
+                    print(f"   - {error}")
                 return False
             else:
                 print("✅ No Firebase configuration errors found")
@@ -90,22 +114,13 @@ class AuthTester:
             print(f"❌ Firebase config test error: {e}")
             return False
     
-    def test_auth_buttons_present(self):
+    async def test_auth_buttons_present(self):
         """Test if authentication buttons are present"""
         print("\n🔍 Testing Authentication Buttons...")
         try:
-            self.driver.get(self.frontend_url)
-            time.sleep(3)
-            
-            # Look for Google auth button
-            google_button = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, "//button[contains(text(), 'Google') or contains(text(), 'Continue with Google')]"))
-            )
-            
-            # Look for GitHub auth button
-            github_button = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, "//button[contains(text(), 'GitHub') or contains(text(), 'Continue with GitHub')]"))
-            )
+            # Buttons are rendered client-side by React, so wait on the live DOM
+            google_button = await self.page.wait_for_selector("button:has-text('Google')", timeout=10000)
+            github_button = await self.page.wait_for_selector("button:has-text('GitHub')", timeout=10000)
             
             if google_button and github_button:
                 print("✅ Authentication buttons found")
@@ -114,7 +129,7 @@ class AuthTester:
                 print("❌ Authentication buttons not found")
                 return False
                 
-        except TimeoutException:
+        except PlaywrightTimeoutError:
             print("❌ Authentication buttons not found within timeout")
             return False
         except Exception as e:
@@ -125,16 +140,12 @@ class AuthTester:
         """Test for JavaScript console errors"""
         print("\n🔍 Testing Console Errors...")
         try:
-            self.driver.get(self.frontend_url)
-            time.sleep(5)
-            
-            logs = self.driver.get_log('browser')
-            errors = [log for log in logs if log['level'] == 'SEVERE']
+            errors = self.console_errors
             
             if errors:
                 print(f"❌ Found {len(errors)} console errors:")
                 for error in errors[:5]:  # Show first 5 errors
-                    print(f"   - {error['message']}")
+                    print(f"   - {error}")
                 return False
             else:
                 print("✅ No console errors found")
@@ -144,21 +155,18 @@ class AuthTester:
             print(f"❌ Console errors test error: {e}")
             return False
     
-    def test_auth_context_initialization(self):
+    async def test_auth_context_initialization(self):
         """Test AuthContext initialization"""
         print("\n🔍 Testing AuthContext Initialization...")
         try:
-            self.driver.get(self.frontend_url)
-            time.sleep(3)
-            
             # Execute JavaScript to check AuthContext state
-            auth_state = self.driver.execute_script("""
+            auth_state = await self.page.evaluate("""() => {
                 // Check if AuthContext is available
                 if (window.React && window.React.useContext) {
                     return 'React available';
                 }
                 return 'React not available';
-            """)
+            }""")
             
             print(f"✅ AuthContext test: {auth_state}")
             return True
@@ -167,34 +175,57 @@ class AuthTester:
             print(f"❌ AuthContext test error: {e}")
             return False
     
-    def run_comprehensive_test(self):
+    async def run_browser_tests(self):
+        """Run the browser-based tests against one page load, or None if no browser"""
+        try:
+            if not await self.setup_browser():
+                return None
+            
+            # A frontend that fails to load fails every browser test but keeps the report;
+            # the button check waits for the React-rendered DOM on its own
+            try:
+                await self.page.goto(self.frontend_url, wait_until="load")
+            except Exception as e:
+                print(f"❌ Failed to load frontend in browser: {e}")
+                return [(test_name, False) for test_name in BROWSER_TESTS]
+            
+            # Browser-based tests share a single page and run in order
+            return [
+                ("Firebase Config", self.test_firebase_config()),
+                ("Auth Buttons", await self.test_auth_buttons_present()),
+                ("Console Errors", self.test_console_errors()),
+                ("AuthContext Init", await self.test_auth_context_initialization()),
+            ]
+            
+        finally:
+            await self.teardown_browser()
+    
+    async def run_comprehensive_test(self):
         """Run all tests"""
         print("🚀 Starting Comprehensive Authentication Test...")
         print("=" * 60)
         
-        results = []
-        
-        # Test backend
-        results.append(("Backend Health", self.test_backend_health()))
+        # Backend and frontend HTTP checks overlap with the browser session
+        async with httpx.AsyncClient() as client:
+            self.client = client
+            try:
+                backend_ok, frontend_ok, browser_results = await asyncio.gather(
+                    self.test_backend_health(),
+                    self.test_frontend_access(),
+                    self.run_browser_tests(),
+                )
+            finally:
+                self.client = None
         
-        # Test frontend
-        results.append(("Frontend Access", self.test_frontend_access()))
+        results = [
+            ("Backend Health", backend_ok),
+            ("Frontend Access", frontend_ok),
+        ]
         
-        # Setup driver for browser tests
-        if not self.setup_driver():
-            print("❌ Cannot run browser tests without Chrome driver")
+        if browser_results is None:
+            print("❌ Cannot run browser tests without a browser")
             return
-        
-        try:
-            # Browser-based tests
-            results.append(("Firebase Config", self.test_firebase_config()))
-            results.append(("Auth Buttons", self.test_auth_buttons_present()))
-            results.append(("Console Errors", self.test_console_errors()))
-            results.append(("AuthContext Init", self.test_auth_context_initialization()))
-            
-        finally:
-            if self.driver:
-                self.driver.quit()
+        results.extend(browser_results)
         
         # Print results
         print("\n" + "=" * 60)
@@ -222,7 +253,7 @@ class AuthTester:
 
 def main():
     tester = AuthTester()
-    success = tester.run_comprehensive_test()
+    success = asyncio.run(tester.run_comprehensive_test())
     exit(0 if success else 1)
 
 if __name__ == "__main__":
@@ -1,5 +1,12 @@
 import requests
 import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
 
 # Test the generate-project endpoint
 url = "http://localhost:8000/api/code/generate-project"
@@ -9,9 +16,32 @@ data = {
     "project_type": "web"
 }
 
-try:
-    response = requests.post(url, json=data)
-    print(f"Status Code: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2)}")
-except Exception as e:
-    print(f"Error: {e}")
+# Reuse one connection; generation can take a while, so allow a long read
+session = requests.Session()
+TIMEOUT = (1.0, 60)  # (connect, read) seconds
+
+# Retry connection failures and transient gateway errors, but never re-send a
+# generation request the server may still be working on (read timeout or 504)
+session.mount("http://", HTTPAdapter(max_retries=Retry(
+    total=2, read=False, backoff_factor=0.3, status_forcelist=(502, 503),
+    allowed_methods=frozenset(["GET", "HEAD", "OPTIONS", "POST"]),
+    raise_on_status=False)))
+
+def format_json(body):
+    """Decode a JSON response body and pretty-print it"""
+    if orjson is not None:
+        return orjson.dumps(orjson.loads(body), option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(json.loads(body), indent=2)
+
+def main():
+    try:
+        response = session.post(url, json=data, timeout=TIMEOUT)
+        print(f"Status Code: {response.status_code}")
+        print(f"Response: {format_json(response.content)}")
+    except Exception as e:
+        print(f"Error: {e}")
+    finally:
+        session.close()
+
+if __name__ == "__main__":
+    main()